@@ -11,8 +11,8 @@ from pathlib import Path
 
 def check_python_version():
     """Check Python version compatibility"""
-    if sys.version_info < (3, 8):
-        print("❌ Error: Python 3.8 or higher is required")
+    if sys.version_info < (3, 9):
+        print("❌ Error: Python 3.9 or higher is required")
         print(f"Current version: {sys.version}")
         return False
     
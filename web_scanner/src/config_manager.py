@@ -1,14 +1,41 @@
-import json
+import asyncio
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any
+
+import orjson
 
 class ConfigManager:
     """Configuration management for web scanner"""
     
+    # Seconds to coalesce set() calls before writing to disk
+    FLUSH_DELAY = 1.0
+    
     def __init__(self, config_file: str = "config/config.json"):
         self.config_file = Path(config_file)
-        self.config = self._load_config()
+        self._config = None
+        self._flat = None
+        self._dirty = False
+        self._flush_handle = None
+        self._listeners: List[Callable[[str, Any], None]] = []
+    
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Configuration dict, loaded from disk on first access"""
+        if self._config is None:
+            self._config = self._load_config()
+        return self._config
+    
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """Index every node of the config tree by its dotted key path"""
+        flat = {}
+        for k, value in config.items():
+            key = f"{prefix}{k}"
+            flat[key] = value
+            if isinstance(value, dict):
+                flat.update(ConfigManager._flatten(value, f"{key}."))
+        return flat
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file"""
@@ -60,7 +87,9 @@ class ConfigManager:
             },
             "database": {
                 "type": "sqlite",
-                "path": "data/scanner.db"
+                "path": "data/scanner.db",
+                "reader_pool_size": 5,
+                "keywords_format": "msgpack"
             },
             "logging": {
                 "level": "INFO",
@@ -70,8 +99,7 @@ class ConfigManager:
         
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
+                loaded_config = orjson.loads(self.config_file.read_bytes())
                 # Merge with defaults
                 return {**default_config, **loaded_config}
             except Exception as e:
@@ -85,19 +113,16 @@ class ConfigManager:
     
     def _save_config(self, config: Dict[str, Any]):
         """Save configuration to file"""
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        # Write to a temporary file and rename so readers never see a partial file
+        tmp_file = self.config_file.with_suffix('.tmp')
+        tmp_file.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_file, self.config_file)
     
     def get(self, key: str, default=None):
         """Get configuration value"""
-        keys = key.split('.')
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        return value
+        if self._flat is None:
+            self._flat = self._flatten(self.config)
+        return self._flat.get(key, default)
     
     def set(self, key: str, value: Any):
         """Set configuration value"""
@@ -108,4 +133,39 @@ class ConfigManager:
                 config[k] = {}
             config = config[k]
         config[keys[-1]] = value
-        self._save_config(self.config)
\ No newline at end of file
+        self._flat = self._flatten(self.config)
+        self._dirty = True
+        self._schedule_flush()
+        
+        for listener in list(self._listeners):
+            listener(key, value)
+    
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """Register callback(key, value), invoked after each set()"""
+        self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[str, Any], None]):
+        """Unregister a callback added with add_listener()"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _schedule_flush(self):
+        """Debounce writes on a running event loop, write through otherwise"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.FLUSH_DELAY, self.flush)
+    
+    def flush(self):
+        """Write pending configuration changes to disk"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        if self._dirty:
+            self._save_config(self.config)
+            self._dirty = False
\ No newline at end of file
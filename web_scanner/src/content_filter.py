@@ -1,10 +1,119 @@
+import hashlib
 import logging
 import re
-from typing import Dict, Any, List
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Callable, Iterator, List, Pattern, Tuple
+
+try:
+    import re2  # google-re2: linear-time matching, immune to backtracking blowups
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick  # pyahocorasick: one linear pass regardless of term count
+except ImportError:
+    ahocorasick = None
+
+# High priority keywords, matched in a single scan
+_PRIORITY_RE = re.compile(
+    r'\b(?:urgent|breaking|alert|important|critical|emergency|update|announcement)\b',
+    re.IGNORECASE
+)
+
+def _is_word_char(text: str, index: int) -> bool:
+    """Check whether text[index] is a regex word character (out of range is not)"""
+    if index < 0 or index >= len(text):
+        return False
+    char = text[index]
+    return char.isalnum() or char == '_'
+
+def _build_pattern(terms: Tuple[str, ...], word_boundaries: bool) -> Pattern:
+    """Compile terms into one case-insensitive alternation pattern"""
+    # RE2's \b is ASCII-only, so keep non-ASCII term lists on the stdlib engine
+    engine = re2 if re2 is not None and all(term.isascii() for term in terms) else re
+    alternation = '(?:' + '|'.join(map(engine.escape, terms)) + ')'
+    if word_boundaries:
+        alternation = r'\b' + alternation + r'\b'
+    return engine.compile('(?i)' + alternation)
+
+@lru_cache(maxsize=128)
+def _compile_terms(terms: Tuple[str, ...], word_boundaries: bool = True) -> Pattern:
+    """Compile terms into a single alternation pattern (shared across instances)"""
+    return _build_pattern(terms, word_boundaries)
+
+@lru_cache(maxsize=128)
+def _compile_each(terms: Tuple[str, ...], word_boundaries: bool = True) -> Tuple[Pattern, ...]:
+    """Compile one pattern per term (shared across instances)"""
+    return tuple(_build_pattern((term,), word_boundaries) for term in terms)
+
+@lru_cache(maxsize=128)
+def _build_automaton(terms: Tuple[str, ...]):
+    """Build an Aho-Corasick automaton for terms (shared across instances)"""
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        automaton.add_word(term, term)
+    automaton.make_automaton()
+    return automaton
+
+class TermMatcher:
+    """Multi-term matcher using Aho-Corasick, or a fused regex alternation as fallback"""
+    
+    def __init__(self, terms: List[str], word_boundaries: bool = True):
+        # Longest first so overlapping terms prefer the most specific match
+        self.terms = tuple(sorted({term.lower() for term in terms if term}, key=len, reverse=True))
+        self.word_boundaries = word_boundaries
+        self._automaton = None
+        self._pattern = None
+        self._term_patterns = None
+        
+        if not self.terms:
+            return
+        
+        if ahocorasick is not None:
+            self._automaton = _build_automaton(self.terms)
+        else:
+            self._pattern = _compile_terms(self.terms, word_boundaries)
+    
+    def __bool__(self) -> bool:
+        return bool(self.terms)
+    
+    def _iter_matches(self, text: str) -> Iterator[str]:
+        """Yield matched terms in a single pass over lowercased text"""
+        if self._automaton is not None:
+            for end, term in self._automaton.iter(text):
+                if self.word_boundaries:
+                    start = end - len(term) + 1
+                    if _is_word_char(text, start - 1) == _is_word_char(text, start):
+                        continue
+                    if _is_word_char(text, end) == _is_word_char(text, end + 1):
+                        continue
+                yield term
+        elif self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                yield match.group(0).lower()
+    
+    def search(self, text: str) -> bool:
+        """Check if text contains any of the terms"""
+        return next(self._iter_matches(text), None) is not None
+    
+    def count(self, text: str) -> int:
+        """Count how many distinct terms occur in text"""
+        if self._pattern is None:
+            return len(set(self._iter_matches(text)))
+        
+        # The fused alternation skips terms overlapping an earlier match
+        # ("learning" inside "machine learning"), so count with one pattern per term
+        if self._term_patterns is None:
+            self._term_patterns = _compile_each(self.terms, self.word_boundaries)
+        return sum(1 for pattern in self._term_patterns if pattern.search(text))
 
 class ContentFilter:
     """Content filtering and relevance detection"""
     
+    # Number of articles whose evaluation results are kept
+    CACHE_SIZE = 1024
+    
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -15,18 +124,50 @@ class ContentFilter:
         self.min_content_length = config.get('content_filter.min_content_length', 100)
         self.learning_enabled = config.get('content_filter.learning_enabled', True)
         
-        # Compile regex patterns for performance
-        self.keyword_patterns = [re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE) 
-                                 for keyword in self.keywords]
-        self.blacklist_patterns = [re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE) 
-                                   for term in self.blacklist]
+        # Build one matcher per term list so each check is a single scan
+        self.keyword_matcher = TermMatcher(self.keywords)
+        self.blacklist_matcher = TermMatcher(self.blacklist)
+        
+        # Evaluation results keyed by article hash (LRU ordered)
+        self._cache: OrderedDict = OrderedDict()
+    
+    def _cached(self, article: Dict[str, Any], name: str, compute: Callable[[Dict[str, Any]], Any]) -> Any:
+        """Return a cached evaluation result for article, computing it on miss"""
+        text = f"{article.get('title', '')}\0{article.get('content', '')}"
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        
+        entry = self._cache.get(key)
+        if entry is None:
+            entry = self._cache[key] = {}
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        
+        if name not in entry:
+            entry[name] = compute(article)
+        return entry[name]
+    
+    @staticmethod
+    def _normalize(article: Dict[str, Any]) -> str:
+        """Lowercased title and content, computed once and stored on the article"""
+        text = article.get('_normalized_text')
+        if text is None:
+            text = article['_normalized_text'] = f"{article.get('title', '')} {article.get('content', '')}".lower()
+        return text
     
     async def is_relevant(self, article: Dict[str, Any]) -> bool:
         """Check if article is relevant based on filtering criteria"""
+        return self._cached(article, 'relevant', self._check_relevance)
+    
+    async def are_relevant_batch(self, articles: List[Dict[str, Any]]) -> List[bool]:
+        """Check relevance of a batch of articles in one call"""
+        return [self._cached(article, 'relevant', self._check_relevance) for article in articles]
+    
+    def _check_relevance(self, article: Dict[str, Any]) -> bool:
+        """Uncached relevance check"""
         try:
-            title = article.get('title', '').lower()
-            content = article.get('content', '').lower()
-            combined_text = f"{title} {content}"
+            combined_text = self._normalize(article)
             
             # Check minimum content length
             if len(combined_text) < self.min_content_length:
@@ -49,20 +190,14 @@ class ContentFilter:
     
     def _contains_keywords(self, text: str) -> bool:
         """Check if text contains any keywords"""
-        if not self.keywords:
+        if not self.keyword_matcher:
             return True  # No keywords specified, accept all
         
-        for pattern in self.keyword_patterns:
-            if pattern.search(text):
-                return True
-        return False
+        return self.keyword_matcher.search(text)
     
     def _contains_blacklisted_terms(self, text: str) -> bool:
         """Check if text contains blacklisted terms"""
-        for pattern in self.blacklist_patterns:
-            if pattern.search(text):
-                return True
-        return False
+        return self.blacklist_matcher.search(text)
     
     def _additional_relevance_checks(self, article: Dict[str, Any]) -> bool:
         """Additional relevance checks"""
@@ -79,7 +214,7 @@ class ContentFilter:
             return False
         
         # Check for excessive capitalization (spam indicator)
-        if sum(1 for c in title if c.isupper()) / len(title) > 0.3:
+        if sum(map(str.isupper, title)) / len(title) > 0.3:
             return False
         
         return True
@@ -92,12 +227,11 @@ class ContentFilter:
             return True
         
         # Check word diversity
-        unique_words = set(words)
-        if len(unique_words) / len(words) < 0.3:
+        if len(set(words)) / len(words) < 0.3:
             return True
         
-        # Check for excessive punctuation
-        punctuation_count = sum(1 for c in content if c in '!?')
+        # Check for excessive punctuation (str.count runs in C)
+        punctuation_count = content.count('!') + content.count('?')
         if punctuation_count / len(content) > 0.05:
             return True
         
@@ -105,27 +239,16 @@ class ContentFilter:
     
     async def is_high_priority(self, article: Dict[str, Any]) -> bool:
         """Check if article should be high priority for notifications"""
+        # High priority keywords (cached); recency depends on the clock, so it is checked every time
+        if self._cached(article, 'priority_keywords', self._has_priority_keywords):
+            return True
+        
+        return self._is_recent_content(article)
+    
+    def _has_priority_keywords(self, article: Dict[str, Any]) -> bool:
+        """Uncached priority keyword check"""
         try:
-            title = article.get('title', '').lower()
-            content = article.get('content', '').lower()
-            combined_text = f"{title} {content}"
-            
-            # High priority keywords
-            high_priority_keywords = [
-                'urgent', 'breaking', 'alert', 'important', 
-                'critical', 'emergency', 'update', 'announcement'
-            ]
-            
-            for keyword in high_priority_keywords:
-                if keyword in combined_text:
-                    return True
-            
-            # Check for recent timestamps
-            if self._is_recent_content(article):
-                return True
-            
-            return False
-            
+            return _PRIORITY_RE.search(self._normalize(article)) is not None
         except Exception as e:
             self.logger.error(f"Error in priority check: {e}")
             return False
@@ -146,18 +269,26 @@ class ContentFilter:
     
     def calculate_relevance_score(self, article: Dict[str, Any]) -> float:
         """Calculate relevance score (0.0 to 1.0)"""
+        score = self._cached(article, 'relevance_score', self._compute_relevance_score)
+        
+        # Recency score, outside the cache since it changes with the clock
+        if self._is_recent_content(article):
+            score += 0.1
+        
+        return min(score, 1.0)
+    
+    def _compute_relevance_score(self, article: Dict[str, Any]) -> float:
+        """Uncached relevance score calculation, without the recency part"""
         try:
-            title = article.get('title', '')
             content = article.get('content', '')
-            combined_text = f"{title} {content}".lower()
+            combined_text = self._normalize(article)
             
             score = 0.0
             
             # Keyword matching
-            keyword_matches = sum(1 for pattern in self.keyword_patterns 
-                                if pattern.search(combined_text))
-            if self.keywords:
-                score += (keyword_matches / len(self.keywords)) * 0.4
+            if self.keyword_matcher:
+                keyword_matches = self.keyword_matcher.count(combined_text)
+                score += (keyword_matches / len(self.keyword_matcher.terms)) * 0.4
             
             # Content length score
             content_length = len(combined_text)
@@ -171,11 +302,7 @@ class ContentFilter:
                 quality_score = 0.0
             score += quality_score
             
-            # Recency score
-            if self._is_recent_content(article):
-                score += 0.1
-            
-            return min(score, 1.0)
+            return score
             
         except Exception as e:
             self.logger.error(f"Error calculating relevance score: {e}")
@@ -184,13 +311,13 @@ class ContentFilter:
     def update_keywords(self, new_keywords: List[str]):
         """Update keywords for filtering"""
         self.keywords = new_keywords
-        self.keyword_patterns = [re.compile(r'\b' + re.escape(keyword) + r'\b', re.IGNORECASE) 
-                                for keyword in self.keywords]
+        self.keyword_matcher = TermMatcher(self.keywords)
+        self._cache.clear()
         self.logger.info(f"Updated keywords: {new_keywords}")
     
     def update_blacklist(self, new_blacklist: List[str]):
         """Update blacklist terms"""
         self.blacklist = new_blacklist
-        self.blacklist_patterns = [re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE) 
-                                  for term in self.blacklist]
+        self.blacklist_matcher = TermMatcher(self.blacklist)
+        self._cache.clear()
         self.logger.info(f"Updated blacklist: {new_blacklist}")
\ No newline at end of file
@@ -1,11 +1,50 @@
+import asyncio
+import itertools
 import logging
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 
+from .url_utils import domain_of
+
+try:
+    # libjpeg-turbo via PyTurboJPEG; needs the shared library installed on the system
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _TURBO_JPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _TURBO_JPEG = None
+
+# Per-process sequence number that keeps output filenames unique
+_FILE_COUNTER = itertools.count()
+
+@lru_cache(maxsize=32)
+def _load_ttf(path: str, size: int):
+    """Load a TrueType font, shared across ImageProcessor instances"""
+    return ImageFont.truetype(path, size)
+
+def _wrap(text: str, font, max_px: int) -> str:
+    """Greedy word wrap using actual glyph widths, measuring each word once"""
+    lines = []
+    line = []
+    width = 0.0
+    space = font.getlength(' ')
+    for word in text.split():
+        word_width = font.getlength(word)
+        if line and width + space + word_width > max_px:
+            lines.append(' '.join(line))
+            line = [word]
+            width = word_width
+        else:
+            width += space + word_width if line else word_width
+            line.append(word)
+    lines.append(' '.join(line))
+    return '\n'.join(lines)
+
 class ImageProcessor:
     """Image processing for creating summary images"""
     
@@ -22,27 +61,42 @@ class ImageProcessor:
         # Create output directory
         self.output_dir = Path("data/summaries")
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Try to load fonts
-        self._load_fonts()
     
-    def _load_fonts(self):
+    @cached_property
+    def _fonts(self) -> Tuple[Any, Any]:
+        """Fonts are loaded on first render rather than at construction"""
+        return self._load_fonts()
+    
+    @property
+    def title_font(self):
+        return self._fonts[0]
+    
+    @property
+    def text_font(self):
+        return self._fonts[1]
+    
+    def _wrap_text(self, text: str, font) -> str:
+        """Wrap text to the image width (20px margin on each side)"""
+        if font is None:
+            return textwrap.fill(text, width=50)  # Approximate character limit
+        return _wrap(text, font, self.width - 40)
+    
+    def _load_fonts(self) -> Tuple[Any, Any]:
         """Load fonts for text rendering"""
         try:
             # Try to use system fonts
-            self.title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 
-                                                 self.font_size + 8)
-            self.text_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 
-                                               self.font_size)
+            title_font = _load_ttf("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 
+                                   self.font_size + 8)
+            text_font = _load_ttf("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 
+                                  self.font_size)
+            return title_font, text_font
         except:
             try:
                 # Fallback to default fonts
-                self.title_font = ImageFont.load_default()
-                self.text_font = ImageFont.load_default()
+                return ImageFont.load_default(), ImageFont.load_default()
             except:
                 self.logger.warning("Could not load fonts, using default")
-                self.title_font = None
-                self.text_font = None
+                return None, None
     
     async def create_summary(self, article: Dict[str, Any]) -> Optional[str]:
         """Create summary image with headline and featured image"""
@@ -66,10 +120,10 @@ class ImageProcessor:
             await self._add_metadata(draw, article)
             
             # Save image
-            filename = f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(article['title']) % 10000}.jpg"
+            filename = f"summary_{datetime.now():%Y%m%d_%H%M%S}_{next(_FILE_COUNTER):06d}.jpg"
             filepath = self.output_dir / filename
             
-            img.save(filepath, 'JPEG', quality=self.quality)
+            await asyncio.to_thread(self._save_jpeg, img, filepath)
             self.logger.info(f"Created summary image: {filepath}")
             
             return str(filepath)
@@ -78,6 +132,14 @@ class ImageProcessor:
             self.logger.error(f"Error creating summary image: {e}")
             return None
     
+    def _save_jpeg(self, img: Image.Image, filepath: Path):
+        """Encode image as JPEG, using libjpeg-turbo directly when available"""
+        if _TURBO_JPEG is not None and img.mode == 'RGB':
+            filepath.write_bytes(_TURBO_JPEG.encode(np.asarray(img), quality=self.quality, 
+                                                    pixel_format=TJPF_RGB))
+        else:
+            img.save(filepath, 'JPEG', quality=self.quality)
+    
     async def _add_featured_image(self, img: Image.Image, draw: ImageDraw.ImageDraw, 
                                  image_path: str) -> int:
         """Add featured image to summary"""
@@ -89,21 +151,19 @@ class ImageProcessor:
                 featured_height = img_height // 2
                 
                 # Resize and crop to fit
-                featured_img = self._resize_and_crop(featured_img, img_width, featured_height)
+                featured_img = await asyncio.to_thread(self._resize_and_crop, featured_img, 
+                                                       img_width, featured_height)
                 
                 # Paste onto main image
                 img.paste(featured_img, (0, 0))
                 
-                # Add subtle gradient overlay for better text readability
-                overlay = Image.new('RGBA', (img_width, featured_height), (0, 0, 0, 0))
-                draw_overlay = ImageDraw.Draw(overlay)
-                
-                for y in range(featured_height):
-                    alpha = int(50 * (1 - y / featured_height))  # Gradient from 50 to 0
-                    draw_overlay.line([(0, y), (img_width, y)], fill=(0, 0, 0, alpha))
-                
-                img.paste(Image.alpha_composite(img.convert('RGBA'), overlay), 
-                         (0, 0), overlay)
+                # Add subtle gradient overlay for better text readability by
+                # scaling the RGB pixels directly instead of compositing RGBA
+                alpha = 50 * (1 - np.arange(featured_height) / featured_height)  # Gradient from 50 to 0
+                factor = (1 - alpha / 255).astype(np.float32)
+                region = np.asarray(img.crop((0, 0, img_width, featured_height)))
+                region = (region * factor[:, None, None]).astype(np.uint8)
+                img.paste(Image.fromarray(region), (0, 0))
             
             return featured_height
             
@@ -122,30 +182,29 @@ class ImageProcessor:
             # Image is wider - crop width
             new_height = target_height
             new_width = int(new_height * img_ratio)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Crop center
-            left = (new_width - target_width) // 2
-            img = img.crop((left, 0, left + target_width, target_height))
         else:
             # Image is taller - crop height
             new_width = target_width
             new_height = int(new_width / img_ratio)
-            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            # Crop center
-            top = (new_height - target_height) // 2
-            img = img.crop((0, top, target_width, top + target_height))
         
-        return img
+        # Box-reduce large sources first so LANCZOS only touches a few pixels
+        factor = min(img.width // new_width, img.height // new_height)
+        if factor > 1 and img.mode in ('L', 'LA', 'RGB', 'RGBA'):
+            img = img.reduce(factor)
+        
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        
+        # Crop center
+        left = (new_width - target_width) // 2
+        top = (new_height - target_height) // 2
+        return img.crop((left, top, left + target_width, top + target_height))
     
     async def _add_title(self, draw: ImageDraw.ImageDraw, title: str, 
                         start_y: int) -> int:
         """Add article title to image"""
         try:
             # Wrap title to fit width
-            max_width = self.width - 40  # 20px margin on each side
-            wrapped_title = textwrap.fill(title, width=50)  # Approximate character limit
+            wrapped_title = self._wrap_text(title, self.title_font)
             
             # Calculate text position
             if self.title_font:
@@ -159,11 +218,8 @@ class ImageProcessor:
             x = (self.width - text_width) // 2
             y = start_y + 20
             
-            # Add text with shadow for better readability
-            shadow_offset = 2
-            draw.text((x + shadow_offset, y + shadow_offset), wrapped_title, 
-                     fill='black', font=self.title_font)
-            draw.text((x, y), wrapped_title, fill='white', font=self.title_font)
+            # The title sits on the white canvas below the featured image, so draw it dark
+            draw.text((x, y), wrapped_title, fill='black', font=self.title_font)
             
             return y + text_height + 20
             
@@ -181,7 +237,7 @@ class ImageProcessor:
                 content = content[:max_chars] + "..."
             
             # Wrap text
-            wrapped_text = textwrap.fill(content, width=60)
+            wrapped_text = self._wrap_text(content, self.text_font)
             
             # Calculate position
             x = 20
@@ -201,11 +257,7 @@ class ImageProcessor:
             source = article.get('source_url', 'Unknown')
             
             # Extract domain from source URL
-            if source != 'Unknown':
-                from urllib.parse import urlparse
-                domain = urlparse(source).netloc
-            else:
-                domain = 'Unknown'
+            domain = domain_of(source) if source else 'Unknown'
             
             metadata_text = f"{timestamp} | {domain}"
             
@@ -238,7 +290,7 @@ class ImageProcessor:
             draw = ImageDraw.Draw(img)
             
             # Add title
-            wrapped_title = textwrap.fill(title, width=40)
+            wrapped_title = self._wrap_text(title, self.title_font)
             
             if self.title_font:
                 bbox = draw.textbbox((0, 0), wrapped_title, font=self.title_font)
@@ -254,9 +306,9 @@ class ImageProcessor:
             draw.text((x, y), wrapped_title, fill='darkblue', font=self.title_font)
             
             # Save
-            filename = f"placeholder_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+            filename = f"placeholder_{datetime.now():%Y%m%d_%H%M%S}_{next(_FILE_COUNTER):06d}.jpg"
             filepath = self.output_dir / filename
-            img.save(filepath, 'JPEG', quality=self.quality)
+            await asyncio.to_thread(self._save_jpeg, img, filepath)
             
             return str(filepath)
             
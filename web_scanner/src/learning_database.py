@@ -1,19 +1,81 @@
+import asyncio
 import logging
+import queue
+import re
 import sqlite3
 import json
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
+import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
+
+try:
+    import msgpack  # Compact binary encoding for the keyword lists
+except ImportError:
+    msgpack = None
+
+from .content_filter import TermMatcher
+
+# Labels the classifier is trained on (0 = not interested, 1 = interested)
+_CLASSES = np.array([0, 1])
+
+# Identifies the layout of model.joblib; older files are ignored and retrained
+_MODEL_TYPE = 'naive_bayes_hashing'
+
+# Keyword extraction: words of four or more letters, minus English stop words
+_TOKEN_RE = re.compile(r'[A-Za-z]{4,}')
+_STOP = frozenset(ENGLISH_STOP_WORDS)
+
+# Hot-path statements. sqlite3 caches compiled statements per connection,
+# keyed by SQL text, so these are parsed once per pooled connection
+_INSERT_ARTICLE = '''
+    INSERT INTO articles 
+    (title, content, image_url, link, source_url, scraped_at, 
+     relevance_score, keywords, keywords_mp, processed)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_INSERT_FEEDBACK = '''
+    INSERT INTO user_feedback 
+    (article_id, feedback_type, feedback_timestamp)
+    VALUES (?, ?, ?)
+'''
+_UPDATE_USER_INTEREST = '''
+    UPDATE articles SET user_interest = ? WHERE id = ?
+'''
+_INSERT_METRIC = '''
+    INSERT INTO performance_metrics 
+    (metric_name, metric_value, timestamp)
+    VALUES (?, ?, ?)
+'''
+_COUNT_NEW_FEEDBACK = '''
+    SELECT COUNT(*) FROM user_feedback 
+    WHERE id > ? AND feedback_type IN ('interested', 'not_interested')
+'''
+_SELECT_TRAINING_ROWS = '''
+    SELECT f.id, a.title, a.content, a.user_interest 
+    FROM user_feedback f 
+    JOIN articles a ON a.id = f.article_id 
+    WHERE f.id > ? 
+      AND f.feedback_type IN ('interested', 'not_interested') 
+      AND a.user_interest IS NOT NULL 
+    ORDER BY f.id
+'''
 
 class LearningDatabase:
     """Learning database for content relevance prediction and optimization"""
     
+    # Performance metrics are buffered in memory up to this many entries
+    # and kept in the database for METRICS_RETENTION_DAYS
+    METRICS_BATCH_SIZE = 100
+    METRICS_RETENTION_DAYS = 30
+    
     def __init__(self, config):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -22,10 +84,34 @@ class LearningDatabase:
         self.db_path = Path(config.get('database.path', 'data/scanner.db'))
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Machine learning components
-        self.vectorizer = None
+        # Substring matchers for keyword scoring and the fallback prediction,
+        # rebuilt when the filter configuration changes
+        self._load_filter_terms()
+        config.add_listener(self._on_config_change)
+        
+        # Machine learning components. The hashing vectorizer is stateless, so
+        # the classifier can be updated incrementally with partial_fit
+        self.vectorizer = HashingVectorizer(n_features=2**18, alternate_sign=False, 
+                                            stop_words='english', norm='l1', 
+                                            dtype=np.float32)
         self.classifier = None
         self.model_trained = False
+        self._last_feedback_id = 0  # Newest user_feedback row the model has seen
+        
+        # Long-lived connections: one writer serialized by a lock, plus a
+        # pool of readers (WAL lets them run alongside the writer)
+        self._write_lock = threading.Lock()
+        self._conn = self._open()
+        self._readers = queue.Queue()
+        for _ in range(config.get('database.reader_pool_size', 5)):
+            self._readers.put(self._open())
+        
+        self._metrics: List[tuple] = []
+        
+        # Keyword lists are stored as MessagePack in keywords_mp, or as JSON
+        # text in keywords when configured (or msgpack is not installed)
+        self._keywords_msgpack = (msgpack is not None and 
+                                  config.get('database.keywords_format', 'msgpack') == 'msgpack')
         
         # Initialize database
         self._init_database()
@@ -33,10 +119,67 @@ class LearningDatabase:
         # Load or train model
         self._load_or_train_model()
     
+    def _load_filter_terms(self):
+        """Build keyword/blacklist matchers from lowercased config terms"""
+        self._keywords_lc = [k.lower() for k in self.config.get('content_filter.keywords', [])]
+        self._blacklist_lc = [t.lower() for t in self.config.get('content_filter.blacklist', [])]
+        self._keyword_matcher = TermMatcher(self._keywords_lc, word_boundaries=False)
+        self._blacklist_matcher = TermMatcher(self._blacklist_lc, word_boundaries=False)
+    
+    def _on_config_change(self, key: str, value: Any):
+        """Refresh cached filter terms when content_filter settings change"""
+        if key.split('.')[0] == 'content_filter':
+            self._load_filter_terms()
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a database connection with performance pragmas applied"""
+        # Autocommit mode: transactions are managed explicitly by _writer()
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        return conn
+    
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """Exclusive use of the writer connection inside a single transaction"""
+        with self._write_lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self._conn
+                self._conn.execute('COMMIT')
+            except BaseException:
+                # Also covers a failed COMMIT, which would otherwise leave the writer mid-transaction
+                if self._conn.in_transaction:
+                    self._conn.execute('ROLLBACK')
+                raise
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the reader pool"""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    def close(self):
+        """Write buffered metrics and close all database connections"""
+        self.config.remove_listener(self._on_config_change)
+        self._write_metrics()
+        with self._write_lock:
+            self._conn.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+    
     def _init_database(self):
         """Initialize database tables"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            # WAL is persistent: commits skip the rollback journal fsync
+            # and readers no longer block the writer
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 
                 # Articles table
@@ -52,10 +195,16 @@ class LearningDatabase:
                         relevance_score REAL,
                         user_interest INTEGER,
                         keywords TEXT,
-                        processed BOOLEAN DEFAULT FALSE
+                        processed BOOLEAN DEFAULT FALSE,
+                        keywords_mp BLOB
                     )
                 ''')
                 
+                # Migrate databases created before keywords_mp existed
+                columns = {row[1] for row in cursor.execute('PRAGMA table_info(articles)')}
+                if 'keywords_mp' not in columns:
+                    cursor.execute('ALTER TABLE articles ADD COLUMN keywords_mp BLOB')
+                
                 # User feedback table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS user_feedback (
@@ -89,13 +238,67 @@ class LearningDatabase:
                     )
                 ''')
                 
-                conn.commit()
+                # Indexes for the statistics and training queries
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_articles_user_interest 
+                    ON articles(user_interest) WHERE user_interest IS NOT NULL
+                ''')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_scraped_at ON articles(scraped_at)')
+                
+                # Full-text index over article title and content
+                self._init_fulltext(cursor)
+                
+                # Give the query planner statistics for the indexes
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'")
+                if cursor.fetchone() is None:
+                    cursor.execute('ANALYZE')
+                else:
+                    cursor.execute('PRAGMA optimize')
+                
                 self.logger.info("Database initialized successfully")
                 
         except Exception as e:
             self.logger.error(f"Error initializing database: {e}")
             raise
     
+    def _init_fulltext(self, cursor: sqlite3.Cursor):
+        """Create the FTS5 index on articles and the triggers keeping it in sync"""
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'")
+            exists = cursor.fetchone() is not None
+            
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts 
+                USING fts5(title, content, content='articles', content_rowid='id')
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts(rowid, title, content) 
+                    VALUES (new.id, new.title, new.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts(articles_fts, rowid, title, content) 
+                    VALUES ('delete', old.id, old.title, old.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, content ON articles BEGIN
+                    INSERT INTO articles_fts(articles_fts, rowid, title, content) 
+                    VALUES ('delete', old.id, old.title, old.content);
+                    INSERT INTO articles_fts(rowid, title, content) 
+                    VALUES (new.id, new.title, new.content);
+                END
+            ''')
+            
+            # Index articles stored before the full-text table existed
+            if not exists:
+                cursor.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+            
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"Full-text search unavailable: {e}")
+    
     def _load_or_train_model(self):
         """Load existing model or train new one"""
         try:
@@ -111,53 +314,54 @@ class LearningDatabase:
         except Exception as e:
             self.logger.error(f"Error with model loading/training: {e}")
     
-    async def record_article(self, article: Dict[str, Any]):
-        """Record article in database"""
+    async def record_articles_bulk(self, articles: List[Dict[str, Any]]):
+        """Record a batch of articles in a single transaction"""
+        if not articles:
+            return
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Calculate initial relevance score
-                relevance_score = self._calculate_relevance_score(article)
-                
-                # Extract keywords
-                keywords = self._extract_keywords(article)
-                
-                cursor.execute('''
-                    INSERT INTO articles 
-                    (title, content, image_url, link, source_url, scraped_at, 
-                     relevance_score, keywords, processed)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    article.get('title', ''),
-                    article.get('cleaned_content', ''),
-                    article.get('image_url', ''),
-                    article.get('link', ''),
-                    article.get('source_url', ''),
-                    article.get('scraped_at', ''),
-                    relevance_score,
-                    json.dumps(keywords),
-                    False
-                ))
-                
-                conn.commit()
-                self.logger.debug(f"Recorded article: {article.get('title', '')[:50]}...")
-                
+            # Scoring and keyword extraction run in a worker thread
+            rows = await asyncio.to_thread(lambda: [self._prepare_row(article) for article in articles])
+            with self._writer() as conn:
+                conn.executemany(_INSERT_ARTICLE, rows)
+            self.logger.debug(f"Recorded {len(rows)} articles")
+            
         except Exception as e:
-            self.logger.error(f"Error recording article: {e}")
+            self.logger.error(f"Error recording articles: {e}")
+    
+    def _prepare_row(self, article: Dict[str, Any]) -> tuple:
+        """Build the articles row for article (CPU-bound, no database access)"""
+        # Calculate initial relevance score
+        relevance_score = self._calculate_relevance_score(article)
+        
+        # Extract keywords
+        keywords = self._extract_keywords(article)
+        if self._keywords_msgpack:
+            keywords_json, keywords_mp = None, msgpack.packb(keywords, use_bin_type=True)
+        else:
+            keywords_json, keywords_mp = json.dumps(keywords), None
+        
+        return (
+            article.get('title', ''),
+            article.get('cleaned_content', ''),
+            article.get('image_url', ''),
+            article.get('link', ''),
+            article.get('source_url', ''),
+            article.get('scraped_at', ''),
+            relevance_score,
+            keywords_json,
+            keywords_mp,
+            False
+        )
     
     async def record_user_feedback(self, article_id: int, feedback_type: str):
         """Record user feedback for learning"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._writer() as conn:
                 cursor = conn.cursor()
                 
                 # Record feedback
-                cursor.execute('''
-                    INSERT INTO user_feedback 
-                    (article_id, feedback_type, feedback_timestamp)
-                    VALUES (?, ?, ?)
-                ''', (article_id, feedback_type, datetime.now().isoformat()))
+                cursor.execute(_INSERT_FEEDBACK, (article_id, feedback_type, datetime.now().isoformat()))
                 
                 # Update article with user interest
                 if feedback_type == 'interested':
@@ -168,17 +372,13 @@ class LearningDatabase:
                     user_interest = None
                 
                 if user_interest is not None:
-                    cursor.execute('''
-                        UPDATE articles SET user_interest = ? WHERE id = ?
-                    ''', (user_interest, article_id))
-                
-                conn.commit()
-                
-                # Retrain model if we have enough new data
-                if self._should_retrain():
-                    self._train_model()
-                
-                self.logger.info(f"Recorded feedback: {feedback_type} for article {article_id}")
+                    cursor.execute(_UPDATE_USER_INTEREST, (user_interest, article_id))
+            
+            # Retrain model if we have enough new data
+            if self._should_retrain():
+                self._train_model()
+            
+            self.logger.info(f"Recorded feedback: {feedback_type} for article {article_id}")
                 
         except Exception as e:
             self.logger.error(f"Error recording user feedback: {e}")
@@ -210,28 +410,35 @@ class LearningDatabase:
             self.logger.error(f"Error predicting interest: {e}")
             return self._basic_interest_prediction(article)
     
+    async def predict_interest_many(self, articles: List[Dict[str, Any]]) -> List[bool]:
+        """Predict interest for a batch of articles with a single model call"""
+        if not articles:
+            return []
+        
+        try:
+            if not self.model_trained:
+                return [self._basic_interest_prediction(article) for article in articles]
+            
+            texts = [f"{article.get('title', '')} {article.get('cleaned_content', '')}" for article in articles]
+            probabilities = self.classifier.predict_proba(self.vectorizer.transform(texts))
+            
+            return (probabilities[:, 1] >= 0.5).tolist()
+            
+        except Exception as e:
+            self.logger.error(f"Error predicting interest: {e}")
+            return [self._basic_interest_prediction(article) for article in articles]
+    
     def _basic_interest_prediction(self, article: Dict[str, Any]) -> bool:
         """Basic interest prediction using keywords"""
         try:
-            # Get keywords from config
-            keywords = self.config.get('content_filter.keywords', [])
-            blacklist = self.config.get('content_filter.blacklist', [])
-            
-            title = article.get('title', '').lower()
-            content = article.get('cleaned_content', '').lower()
-            combined_text = f"{title} {content}"
+            combined_text = f"{article.get('title', '')} {article.get('cleaned_content', '')}".lower()
             
             # Check blacklist
-            for term in blacklist:
-                if term.lower() in combined_text:
-                    return False
+            if self._blacklist_matcher.search(combined_text):
+                return False
             
             # Check keywords
-            for keyword in keywords:
-                if keyword.lower() in combined_text:
-                    return True
-            
-            return False
+            return self._keyword_matcher.search(combined_text)
             
         except Exception as e:
             self.logger.error(f"Error in basic interest prediction: {e}")
@@ -257,11 +464,9 @@ class LearningDatabase:
                 score += 0.2
             
             # Keyword presence
-            keywords = self.config.get('content_filter.keywords', [])
-            keyword_matches = sum(1 for keyword in keywords 
-                                  if keyword.lower() in f"{title} {content}".lower())
-            if keywords:
-                score += (keyword_matches / len(keywords)) * 0.4
+            if self._keyword_matcher:
+                keyword_matches = self._keyword_matcher.count(f"{title} {content}".lower())
+                score += (keyword_matches / len(self._keyword_matcher.terms)) * 0.4
             
             # Image presence
             if article.get('image_url'):
@@ -276,23 +481,13 @@ class LearningDatabase:
     def _extract_keywords(self, article: Dict[str, Any]) -> List[str]:
         """Extract keywords from article"""
         try:
-            from sklearn.feature_extraction.text import CountVectorizer
-            
             text = f"{article.get('title', '')} {article.get('cleaned_content', '')}"
             
-            # Simple keyword extraction
-            vectorizer = CountVectorizer(max_features=10, stop_words='english')
-            try:
-                vectorizer.fit_transform([text])
-                return vectorizer.get_feature_names_out().tolist()
-            except:
-                # Fallback to simple word extraction
-                words = text.lower().split()
-                # Filter out common words
-                common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for'}
-                keywords = [word for word in words if word not in common_words and len(word) > 3]
-                return keywords[:10]
-                
+            # Ten most frequent words
+            tokens = (token.lower() for token in _TOKEN_RE.findall(text))
+            counts = Counter(token for token in tokens if token not in _STOP)
+            return [word for word, _ in counts.most_common(10)]
+            
         except Exception as e:
             self.logger.error(f"Error extracting keywords: {e}")
             return []
@@ -300,7 +495,7 @@ class LearningDatabase:
     def _has_enough_training_data(self) -> bool:
         """Check if there's enough data for training"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT COUNT(*) FROM articles 
@@ -314,56 +509,60 @@ class LearningDatabase:
             return False
     
     def _train_model(self):
-        """Train machine learning model"""
+        """Train machine learning model on feedback received since the last run"""
         try:
-            # Get training data
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT title, content, user_interest 
-                    FROM articles 
-                    WHERE user_interest IS NOT NULL
-                ''')
-                
-                data = cursor.fetchall()
-                
-            if len(data) < 50:
+            if self.classifier is None and not self._has_enough_training_data():
                 self.logger.warning("Not enough data for training")
                 return
             
-            # Prepare training data
-            texts = []
-            labels = []
+            classifier = self.classifier if self.classifier is not None else MultinomialNB()
+            last_feedback_id = self._last_feedback_id
+            trained = 0
+            evaluated = 0
+            correct = 0
             
-            for title, content, user_interest in data:
-                text = f"{title} {content}"
-                texts.append(text)
-                labels.append(user_interest)
-            
-            # Vectorize text
-            self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-            X = self.vectorizer.fit_transform(texts)
-            y = np.array(labels)
-            
-            # Split data
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            
-            # Train classifier
-            self.classifier = MultinomialNB()
-            self.classifier.fit(X_train, y_train)
-            
-            # Evaluate
-            y_pred = self.classifier.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
+            # Stream new training data in batches
+            with self._reader() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = 1000
+                cursor.execute(_SELECT_TRAINING_ROWS, (self._last_feedback_id,))
+                
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    
+                    X = self.vectorizer.transform(f"{title} {content}" for _, title, content, _ in rows)
+                    y = np.fromiter((user_interest for _, _, _, user_interest in rows), 
+                                    dtype=np.int8, count=len(rows))
+                    
+                    # Evaluate each batch before learning from it
+                    if hasattr(classifier, 'classes_'):
+                        correct += int((classifier.predict(X) == y).sum())
+                        evaluated += len(y)
+                    
+                    classifier.partial_fit(X, y, classes=_CLASSES)
+                    trained += len(y)
+                    last_feedback_id = rows[-1][0]
+            
+            if not trained:
+                return
             
-            self.logger.info(f"Model trained with accuracy: {accuracy:.2f}")
+            self.classifier = classifier
+            self._last_feedback_id = last_feedback_id
             self.model_trained = True
             
             # Save model
             self._save_model()
             
-            # Record performance
-            self._record_performance_metric('model_accuracy', accuracy)
+            if evaluated:
+                accuracy = correct / evaluated
+                self.logger.info(f"Model updated with {trained} examples, accuracy: {accuracy:.2f}")
+                
+                # Record performance
+                self._record_performance_metric('model_accuracy', accuracy)
+            else:
+                self.logger.info(f"Model trained with {trained} examples")
             
         except Exception as e:
             self.logger.error(f"Error training model: {e}")
@@ -371,13 +570,17 @@ class LearningDatabase:
     def _load_model(self) -> bool:
         """Load saved model"""
         try:
-            model_file = self.db_path.parent / 'model.json'
+            model_file = self.db_path.parent / 'model.joblib'
             if model_file.exists():
-                with open(model_file, 'r') as f:
-                    model_data = json.load(f)
+                # Memory-map the numpy arrays instead of copying them into RAM;
+                # copy-on-write so partial_fit can still update them
+                bundle = joblib.load(model_file, mmap_mode='c')
+                if bundle.get('model_type') != _MODEL_TYPE:
+                    self.logger.info("Saved model has an outdated format, retraining")
+                    return False
                 
-                # Note: In a real implementation, you'd use joblib or pickle
-                # For simplicity, we're just checking if model exists
+                self.classifier = bundle['classifier']
+                self._last_feedback_id = bundle['last_feedback_id']
                 self.model_trained = True
                 return True
             
@@ -390,14 +593,19 @@ class LearningDatabase:
     def _save_model(self):
         """Save trained model"""
         try:
-            model_file = self.db_path.parent / 'model.json'
+            model_file = self.db_path.parent / 'model.joblib'
             model_data = {
+                'classifier': self.classifier,
+                'last_feedback_id': self._last_feedback_id,
                 'trained_at': datetime.now().isoformat(),
-                'model_type': 'naive_bayes'
+                'model_type': _MODEL_TYPE
             }
             
-            with open(model_file, 'w') as f:
-                json.dump(model_data, f)
+            # Uncompressed so it can be memory-mapped; written aside and renamed
+            # so a previously mapped model file is never modified in place
+            tmp_file = model_file.with_suffix('.tmp')
+            joblib.dump(model_data, tmp_file)
+            tmp_file.replace(model_file)
             
             self.logger.info("Model saved successfully")
             
@@ -407,39 +615,77 @@ class LearningDatabase:
     def _should_retrain(self) -> bool:
         """Check if model should be retrained"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT COUNT(*) FROM user_feedback 
-                    WHERE feedback_timestamp > datetime('now', '-1 day')
-                ''')
-                recent_feedback = cursor.fetchone()[0]
+                cursor.execute(_COUNT_NEW_FEEDBACK, (self._last_feedback_id,))
+                new_feedback = cursor.fetchone()[0]
                 
-                return recent_feedback >= 10  # Retrain after 10 new feedback entries
+                return new_feedback >= 10  # Retrain after 10 new feedback entries
                 
         except Exception as e:
             self.logger.error(f"Error checking retrain condition: {e}")
             return False
     
     def _record_performance_metric(self, metric_name: str, value: float):
-        """Record performance metric"""
+        """Record performance metric (buffered, written in batches)"""
+        self._metrics.append((metric_name, value, datetime.now().isoformat()))
+        if len(self._metrics) >= self.METRICS_BATCH_SIZE:
+            self._write_metrics()
+    
+    def _write_metrics(self):
+        """Insert buffered performance metrics in a single transaction"""
+        if not self._metrics:
+            return
+        
+        rows, self._metrics = self._metrics, []
+        try:
+            with self._writer() as conn:
+                conn.executemany(_INSERT_METRIC, rows)
+                
+        except Exception as e:
+            self.logger.error(f"Error recording performance metrics: {e}")
+    
+    def housekeeping(self):
+        """Write buffered metrics and drop metrics past the retention period"""
+        self._write_metrics()
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            cutoff = (datetime.now() - timedelta(days=self.METRICS_RETENTION_DAYS)).isoformat()
+            with self._writer() as conn:
+                deleted = conn.execute(
+                    'DELETE FROM performance_metrics WHERE timestamp < ?', (cutoff,)
+                ).rowcount
+            self.logger.info(f"Housekeeping removed {deleted} old performance metrics")
+            
+        except Exception as e:
+            self.logger.error(f"Error during database housekeeping: {e}")
+    
+    def search_articles(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Search stored articles with an FTS5 query, best matches first"""
+        try:
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT INTO performance_metrics 
-                    (metric_name, metric_value, timestamp)
-                    VALUES (?, ?, ?)
-                ''', (metric_name, value, datetime.now().isoformat()))
-                conn.commit()
+                    SELECT a.id, a.title, a.link, a.scraped_at 
+                    FROM articles_fts 
+                    JOIN articles a ON a.id = articles_fts.rowid 
+                    WHERE articles_fts MATCH ? 
+                    ORDER BY rank 
+                    LIMIT ?
+                ''', (query, limit))
+                
+                return [
+                    {'id': row[0], 'title': row[1], 'link': row[2], 'scraped_at': row[3]}
+                    for row in cursor.fetchall()
+                ]
                 
         except Exception as e:
-            self.logger.error(f"Error recording performance metric: {e}")
+            self.logger.error(f"Error searching articles: {e}")
+            return []
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get database statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 
                 stats = {}
@@ -7,6 +7,7 @@ Periodically scans websites, filters content, creates summary images and sends n
 import asyncio
 import logging
 import schedule
+import signal
 import time
 from datetime import datetime
 from pathlib import Path
@@ -48,7 +49,7 @@ async def main():
         content_filter = ContentFilter(config)
         image_processor = ImageProcessor(config)
         learning_db = LearningDatabase(config)
-        telegram_notifier = TelegramNotifier(config)
+        telegram_notifier = TelegramNotifier(config, learning_db)
         
         # Initialize web scraper with TOR support
         scraper = WebScraper(
@@ -60,25 +61,38 @@ async def main():
             notifier=telegram_notifier
         )
         
+        # Connect to TOR before the scraper builds its (proxied) HTTP session
+        await tor_manager.start()
+        await scraper.start()
+        
         # Setup scheduler
         scheduler = ScannerScheduler(scraper, config)
-        scheduler.start()
+        await scheduler.start()
         
         logger.info("Web Scanner started successfully")
         
-        # Keep the main thread alive
-        while True:
-            await asyncio.sleep(1)
-            
-    except KeyboardInterrupt:
+        # Park the main task until SIGINT/SIGTERM; scans run as tasks on this event loop
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        
+        await stop_event.wait()
         logger.info("Received interrupt signal, shutting down...")
+            
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
     finally:
         if 'scheduler' in locals():
             scheduler.stop()
+        if 'scraper' in locals():
+            await scraper.stop()
         if 'tor_manager' in locals():
             await tor_manager.stop()
+        if 'learning_db' in locals():
+            learning_db.close()
+        if 'config' in locals():
+            config.flush()
         logger.info("Web Scanner stopped")
 
 if __name__ == "__main__":
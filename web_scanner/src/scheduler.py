@@ -1,7 +1,5 @@
 import asyncio
 import logging
-import threading
-import time
 from datetime import datetime, timedelta
 from typing import Callable, Optional
 
@@ -17,56 +15,67 @@ class ScannerScheduler:
         self.scan_interval = config.get('scan_interval', 3600)  # Default: 1 hour
         self.enabled = True
         self.running = False
-        self.thread = None
+        self._task = None
+        self._wakeup = None  # Set to make the scheduler loop re-check its schedule
         
         # Statistics
         self.last_scan = None
         self.next_scan = None
+        self.last_housekeeping = None
         self.total_scans = 0
         self.successful_scans = 0
         self.failed_scans = 0
     
-    def start(self):
-        """Start the scheduler"""
+    async def start(self):
+        """Start the scheduler on the running event loop"""
         if self.running:
             self.logger.warning("Scheduler is already running")
             return
         
         self.enabled = True
         self.running = True
-        self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
-        self.thread.start()
+        self._wakeup = asyncio.Event()
         
         self.logger.info(f"Scheduler started with interval: {self.scan_interval} seconds")
         self._schedule_next_scan()
+        self._task = asyncio.create_task(self._run_scheduler())
     
     def stop(self):
         """Stop the scheduler"""
         self.enabled = False
         self.running = False
         
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=10)
+        if self._task and not self._task.done():
+            self._task.cancel()
         
         self.logger.info("Scheduler stopped")
     
-    def _run_scheduler(self):
+    async def _run_scheduler(self):
         """Main scheduler loop"""
         while self.running:
             try:
-                current_time = datetime.now()
+                # Sleep while paused until resumed
+                if not self.enabled:
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
                 
-                # Check if it's time to scan
-                if self.next_scan and current_time >= self.next_scan:
-                    asyncio.run(self._perform_scan())
-                    self._schedule_next_scan()
+                # Sleep until the next scan is due or the schedule changes
+                delay = (self.next_scan - datetime.now()).total_seconds()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+                    continue
                 
-                # Sleep for a short interval
-                time.sleep(60)  # Check every minute
+                await self._perform_scan()
+                self._schedule_next_scan()
                 
             except Exception as e:
                 self.logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(60)
+                await asyncio.sleep(60)
     
     def _schedule_next_scan(self):
         """Schedule the next scan"""
@@ -75,6 +84,9 @@ class ScannerScheduler:
         else:
             self.next_scan = datetime.now() + timedelta(seconds=60)  # First scan in 1 minute
         
+        # Don't rescan back to back when the last scan failed or is long overdue
+        self.next_scan = max(self.next_scan, datetime.now() + timedelta(seconds=60))
+        
         self.logger.info(f"Next scan scheduled for: {self.next_scan}")
     
     async def _perform_scan(self):
@@ -90,6 +102,10 @@ class ScannerScheduler:
             # Perform the scan
             results = await self.scraper.scan_websites()
             
+            # Daily database maintenance
+            if hasattr(self.scraper, 'learning_db'):
+                self._run_housekeeping()
+            
             # Update statistics
             self.last_scan = datetime.now()
             self.total_scans += 1
@@ -110,6 +126,15 @@ class ScannerScheduler:
             # Send error notification
             await self._send_error_notification(e)
     
+    def _run_housekeeping(self):
+        """Run database housekeeping at most once a day"""
+        now = datetime.now()
+        if self.last_housekeeping and now - self.last_housekeeping < timedelta(days=1):
+            return
+        
+        self.scraper.learning_db.housekeeping()
+        self.last_housekeeping = now
+    
     async def _send_scan_summary(self, results):
         """Send scan summary notification"""
         try:
@@ -132,11 +157,7 @@ class ScannerScheduler:
             
             # Send via Telegram notifier if available
             if hasattr(self.scraper, 'notifier') and self.scraper.notifier.is_enabled():
-                await self.scraper.notifier.bot.send_message(
-                    chat_id=self.scraper.notifier.chat_id,
-                    text=message,
-                    parse_mode='HTML'
-                )
+                await self.scraper.notifier.send_message(message, parse_mode='HTML')
             
         except Exception as e:
             self.logger.error(f"Error sending scan summary: {e}")
@@ -174,6 +195,7 @@ class ScannerScheduler:
         # Reschedule next scan
         if self.running:
             self._schedule_next_scan()
+            self._wakeup.set()
         
         self.logger.info(f"Scan interval updated to: {interval} seconds")
     
@@ -183,6 +205,7 @@ class ScannerScheduler:
             raise RuntimeError("Scheduler is not running")
         
         self.next_scan = datetime.now()
+        self._wakeup.set()
         self.logger.info("Manual scan triggered")
     
     def get_next_scan_time(self) -> Optional[datetime]:
@@ -208,6 +231,7 @@ class ScannerScheduler:
         
         self.enabled = True
         self._schedule_next_scan()
+        self._wakeup.set()
         self.logger.info("Scheduler resumed")
     
     def is_paused(self) -> bool:
@@ -1,18 +1,61 @@
+import hashlib
+import html
 import logging
 import asyncio
+import time
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any, Optional
 
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler
+import aiofiles
 import aiohttp
 
+from .url_utils import domain_of
+
+# Article notification text, filled in by _create_message
+_MESSAGE_TEMPLATE = """
+🔍 <b>{title}</b>
+
+📄 {content}
+
+🌐 Source: {domain}
+🕒 {time}
+        """
+
+# Feedback keyboard button that is the same for every article (buttons are immutable)
+_STATS_BUTTON = InlineKeyboardButton("📊 Stats", callback_data="stats")
+
+class _TokenBucket:
+    """Async token bucket: allows `capacity` calls at once, refilled at `rate` per second"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class TelegramNotifier:
     """Telegram bot for sending notifications and receiving feedback"""
     
-    def __init__(self, config):
+    def __init__(self, config, learning_db):
         self.config = config
+        self.learning_db = learning_db
         self.logger = logging.getLogger(__name__)
         
         # Telegram configuration
@@ -22,6 +65,14 @@ class TelegramNotifier:
         self.proxy_enabled = config.get('telegram.proxy.enabled', False)
         self.proxy_url = config.get('telegram.proxy.url', '')
         
+        # Client-side rate limits, kept below Telegram's flood limits
+        # (30 messages per second overall, 20 per minute per chat)
+        self._global_bucket = _TokenBucket(rate=30, capacity=30)
+        self._chat_buckets: Dict[Any, _TokenBucket] = {}
+        
+        # Formatted timestamps per format, reused until the displayed value changes
+        self._timestamps: Dict[str, tuple] = {}
+        
         # Initialize bot
         self.bot = None
         self.application = None
@@ -32,17 +83,24 @@ class TelegramNotifier:
     def _initialize_bot(self):
         """Initialize Telegram bot"""
         try:
-            self.bot = Bot(token=self.bot_token)
+            # One application owns the bot and its HTTP connection pools, sized
+            # for concurrent sends so they don't queue for a free connection
+            builder = (
+                Application.builder()
+                .token(self.bot_token)
+                .connection_pool_size(64)
+                .pool_timeout(20.0)
+                .connect_timeout(10.0)
+                .read_timeout(30.0)
+                .get_updates_connection_pool_size(8)
+            )
             
             # Setup proxy if configured
             if self.proxy_enabled and self.proxy_url:
-                import telegram.request
-                request = telegram.request.BaseRequest(
-                    connect_timeout=20,
-                    read_timeout=20,
-                    proxy_url=self.proxy_url
-                )
-                self.bot.request = request
+                builder = builder.proxy(self.proxy_url).get_updates_proxy(self.proxy_url)
+            
+            self.application = builder.build()
+            self.bot = self.application.bot
             
             self.logger.info("Telegram bot initialized successfully")
             
@@ -52,16 +110,14 @@ class TelegramNotifier:
     
     async def start_bot(self):
         """Start Telegram bot for receiving feedback"""
-        if not self.enabled:
+        if not self.enabled or not self.application:
             return
         
         try:
-            # Create application
-            self.application = Application.builder().token(self.bot_token).build()
-            
             # Add handlers
             self.application.add_handler(CommandHandler("start", self._handle_start))
             self.application.add_handler(CommandHandler("stats", self._handle_stats))
+            self.application.add_handler(CommandHandler("search", self._handle_search))
             self.application.add_handler(CommandHandler("help", self._handle_help))
             self.application.add_handler(CallbackQueryHandler(self._handle_callback))
             
@@ -81,6 +137,30 @@ class TelegramNotifier:
             await self.application.shutdown()
             self.logger.info("Telegram bot stopped")
     
+    async def _throttle(self, chat_id):
+        """Wait for the per-chat and global rate limits before sending"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = _TokenBucket(rate=20 / 60, capacity=20)
+        
+        await bucket.acquire()
+        await self._global_bucket.acquire()
+    
+    async def send_message(self, text: str, **kwargs):
+        """Send a text message to the configured chat (rate limited)"""
+        await self._throttle(self.chat_id)
+        return await self.bot.send_message(chat_id=self.chat_id, text=text, **kwargs)
+    
+    async def _reply(self, update, text: str, **kwargs):
+        """Reply to the message of an update or callback query (rate limited)"""
+        await self._throttle(update.message.chat_id)
+        return await update.message.reply_text(text, **kwargs)
+    
+    async def _edit(self, query, text: str, **kwargs):
+        """Edit the message of a callback query (rate limited)"""
+        await self._throttle(query.message.chat_id)
+        return await query.edit_message_text(text, **kwargs)
+    
     async def send_notification(self, article: Dict[str, Any], summary_image_path: Optional[str] = None):
         """Send notification about interesting article"""
         if not self.enabled or not self.bot:
@@ -94,20 +174,29 @@ class TelegramNotifier:
             keyboard = self._create_feedback_keyboard(article)
             reply_markup = InlineKeyboardMarkup(keyboard)
             
+            # Read the image without blocking the event loop (a missing file
+            # falls back to a text message)
+            photo = None
+            if summary_image_path:
+                try:
+                    async with aiofiles.open(summary_image_path, 'rb') as f:
+                        photo = await f.read()
+                except FileNotFoundError:
+                    self.logger.warning(f"Summary image not found: {summary_image_path}")
+            
             # Send message with image if available
-            if summary_image_path and Path(summary_image_path).exists():
-                with open(summary_image_path, 'rb') as photo:
-                    await self.bot.send_photo(
-                        chat_id=self.chat_id,
-                        photo=photo,
-                        caption=message,
-                        reply_markup=reply_markup,
-                        parse_mode='HTML'
-                    )
-            else:
-                await self.bot.send_message(
+            if photo is not None:
+                await self._throttle(self.chat_id)
+                await self.bot.send_photo(
                     chat_id=self.chat_id,
-                    text=message,
+                    photo=photo,
+                    caption=message,
+                    reply_markup=reply_markup,
+                    parse_mode='HTML'
+                )
+            else:
+                await self.send_message(
+                    message,
                     reply_markup=reply_markup,
                     parse_mode='HTML'
                 )
@@ -119,6 +208,16 @@ class TelegramNotifier:
             self.logger.error(f"Error sending notification: {e}")
             return False
     
+    def _now_str(self, seconds: bool = False) -> str:
+        """Current local time for messages, formatted once per minute (or second)"""
+        fmt = '%Y-%m-%d %H:%M:%S' if seconds else '%Y-%m-%d %H:%M'
+        tick = int(time.time()) // (1 if seconds else 60)
+        
+        cached = self._timestamps.get(fmt)
+        if cached is None or cached[0] != tick:
+            cached = self._timestamps[fmt] = (tick, datetime.now().strftime(fmt))
+        return cached[1]
+    
     def _create_message(self, article: Dict[str, Any]) -> str:
         """Create notification message"""
         title = article.get('title', 'No Title')
@@ -131,20 +230,14 @@ class TelegramNotifier:
             content = content[:300] + "..."
         
         # Extract domain from source
-        if source:
-            from urllib.parse import urlparse
-            domain = urlparse(source).netloc
-        else:
-            domain = 'Unknown'
+        domain = domain_of(source) if source else 'Unknown'
         
-        message = f"""
-🔍 <b>{title}</b>
-
-📄 {content}
-
-🌐 Source: {domain}
-🕒 {datetime.now().strftime('%Y-%m-%d %H:%M')}
-        """
+        message = _MESSAGE_TEMPLATE.format(
+            title=title,
+            content=content,
+            domain=domain,
+            time=self._now_str()
+        )
         
         # Add link if available
         if link:
@@ -152,13 +245,20 @@ class TelegramNotifier:
         
         return message
     
+    @staticmethod
+    def _article_hash(article: Dict[str, Any]) -> str:
+        """Short identifier for article, computed once and stored on the article"""
+        article_hash = article.get('_hash')
+        if article_hash is None:
+            article_hash = article['_hash'] = hashlib.blake2b(
+                f"{article.get('title', '')}{article.get('scraped_at', '')}".encode(), digest_size=4
+            ).hexdigest()
+        return article_hash
+    
     def _create_feedback_keyboard(self, article: Dict[str, Any]) -> list:
         """Create inline keyboard for user feedback"""
         # Use article hash as callback data
-        import hashlib
-        article_hash = hashlib.md5(
-            f"{article.get('title', '')}{article.get('scraped_at', '')}".encode()
-        ).hexdigest()[:8]
+        article_hash = self._article_hash(article)
         
         keyboard = [
             [
@@ -167,7 +267,7 @@ class TelegramNotifier:
             ],
             [
                 InlineKeyboardButton("🔗 Open Link", callback_data=f"open_link_{article_hash}"),
-                InlineKeyboardButton("📊 Stats", callback_data="stats")
+                _STATS_BUTTON
             ]
         ]
         
@@ -175,22 +275,22 @@ class TelegramNotifier:
     
     async def _handle_start(self, update, context):
         """Handle /start command"""
-        await update.message.reply_text(
+        await self._reply(
+            update,
             "🤖 Web Scanner Bot\n\n"
             "I'll send you notifications about interesting articles I find.\n"
             "You can provide feedback to help me learn your preferences.\n\n"
             "Commands:\n"
             "/stats - View scanning statistics\n"
+            "/search <words> - Find stored articles\n"
             "/help - Show this help message"
         )
     
     async def _handle_stats(self, update, context):
         """Handle /stats command"""
         try:
-            # Get statistics from learning database
-            from .learning_database import LearningDatabase
-            db = LearningDatabase(self.config)
-            stats = db.get_statistics()
+            # Get statistics from the shared learning database
+            stats = self.learning_db.get_statistics()
             
             message = f"""
 📊 <b>Scanning Statistics</b>
@@ -203,11 +303,40 @@ class TelegramNotifier:
 🤖 Bot Status: {'✅ Active' if self.enabled else '❌ Inactive'}
         """
             
-            await update.message.reply_text(message, parse_mode='HTML')
+            await self._reply(update, message, parse_mode='HTML')
             
         except Exception as e:
             self.logger.error(f"Error handling stats command: {e}")
-            await update.message.reply_text("❌ Error retrieving statistics")
+            await self._reply(update, "❌ Error retrieving statistics")
+    
+    async def _handle_search(self, update, context):
+        """Handle /search command"""
+        if not context.args:
+            await self._reply(update, "Usage: /search <words>")
+            return
+        
+        try:
+            # Quote every word so user input is never parsed as FTS5 query syntax
+            query = ' '.join('"' + word.replace('"', '""') + '"' for word in context.args)
+            articles = self.learning_db.search_articles(query, limit=10)
+            
+            if not articles:
+                await self._reply(update, "🔍 No matching articles found")
+                return
+            
+            lines = [f"🔍 <b>Results for:</b> {html.escape(' '.join(context.args))}", ""]
+            for article in articles:
+                title = html.escape(article['title'] or 'No Title')
+                if article['link']:
+                    title = f'<a href="{html.escape(article["link"])}">{title}</a>'
+                lines.append(f"• {title}")
+            
+            await self._reply(update, '\n'.join(lines), parse_mode='HTML', 
+                              disable_web_page_preview=True)
+            
+        except Exception as e:
+            self.logger.error(f"Error handling search command: {e}")
+            await self._reply(update, "❌ Error searching articles")
     
     async def _handle_help(self, update, context):
         """Handle /help command"""
@@ -231,13 +360,14 @@ I scan websites periodically and send you notifications about interesting articl
 <b>Commands:</b>
 /start - Start the bot
 /stats - View scanning statistics
+/search &lt;words&gt; - Find stored articles
 /help - Show this help
 
 <b>Configuration:</b>
 Edit the config file to add websites and adjust filtering parameters.
         """
         
-        await update.message.reply_text(help_text, parse_mode='HTML')
+        await self._reply(update, help_text, parse_mode='HTML')
     
     async def _handle_callback(self, update, context):
         """Handle callback queries from inline keyboards"""
@@ -265,7 +395,7 @@ Edit the config file to add websites and adjust filtering parameters.
             
         except Exception as e:
             self.logger.error(f"Error handling callback: {e}")
-            await query.edit_message_text("❌ Error processing your feedback")
+            await self._edit(query, "❌ Error processing your feedback")
     
     async def _process_feedback(self, query, feedback_type: str, article_hash: str):
         """Process user feedback"""
@@ -278,7 +408,7 @@ Edit the config file to add websites and adjust filtering parameters.
                 'not_interested': "👎 Got it! I'll avoid similar content in the future."
             }
             
-            await query.edit_message_text(feedback_messages.get(feedback_type, "✅ Feedback received"))
+            await self._edit(query, feedback_messages.get(feedback_type, "✅ Feedback received"))
             
             # Here you would typically:
             # 1. Find the article in the database
@@ -296,7 +426,7 @@ Edit the config file to add websites and adjust filtering parameters.
             # In a real implementation, you'd find the article by hash
             # and send the actual link
             
-            await query.edit_message_text("🔗 Opening article link...")
+            await self._edit(query, "🔗 Opening article link...")
             
             # Here you would typically find the article and send the link
             
@@ -314,15 +444,11 @@ Edit the config file to add websites and adjust filtering parameters.
 
 Web Scanner Bot is working correctly!
 
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Time: {self._now_str(seconds=True)}
 Status: ✅ Active
             """
             
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
+            await self.send_message(message, parse_mode='HTML')
             
             self.logger.info("Test message sent successfully")
             return True
@@ -342,14 +468,10 @@ Status: ✅ Active
 
 {error_message}
 
-Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Time: {self._now_str(seconds=True)}
             """
             
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
+            await self.send_message(message, parse_mode='HTML')
             
         except Exception as e:
             self.logger.error(f"Error sending error notification: {e}")
@@ -3,6 +3,8 @@ import logging
 import socket
 from typing import Optional
 
+import aiohttp
+from aiohttp_socks import ProxyConnector
 from stem import Signal
 from stem.control import Controller
 from stem.connection import AuthenticationFailure
@@ -17,7 +19,14 @@ class TorManager:
         self.tor_port = config.get('tor.port', 9050)
         self.control_port = config.get('tor.control_port', 9051)
         self.password = config.get('tor.password', '')
+        
+        # SOCKS proxy settings, built once and shared by every caller
+        self._proxy_url = f'socks5://127.0.0.1:{self.tor_port}'
+        self._proxies = {'http': self._proxy_url, 'https': self._proxy_url}
+        
         self._controller = None
+        self._controller_lock = asyncio.Lock()
+        self._session = None
         self._connected = False
     
     async def start(self):
@@ -46,34 +55,59 @@ class TorManager:
                 self._controller.close()
             except:
                 pass
+            self._controller = None
+        if self._session:
+            await self._session.close()
+            self._session = None
         self._connected = False
         self.logger.info("TOR connection stopped")
     
-    async def _test_tor_connection(self) -> bool:
-        """Test if TOR is working"""
-        try:
-            # Check if TOR control port is accessible
-            with Controller.from_port(port=self.control_port) as controller:
+    def _get_controller(self) -> Controller:
+        """Authenticated control port connection, opened once and reused"""
+        if self._controller is None or not self._controller.is_alive():
+            if self._controller is not None:
+                self._controller.close()
+            
+            controller = Controller.from_port(port=self.control_port)
+            try:
                 if self.password:
                     controller.authenticate(password=self.password)
                 else:
                     controller.authenticate()
+            except Exception:
+                controller.close()
+                raise
+            self._controller = controller
+        
+        return self._controller
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """HTTP session routed through the TOR SOCKS port, created on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=ProxyConnector.from_url(self._proxy_url, rdns=True),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def _test_tor_connection(self) -> bool:
+        """Test if TOR is working"""
+        try:
+            # Check if TOR control port is accessible (the connection is kept for rotate_ip)
+            async with self._controller_lock:
+                self._get_controller()
+            
+            # Check the TOR project page through the SOCKS port
+            async with self._get_session().get('https://check.torproject.org/') as response:
+                text = await response.text()
+            
+            if 'Congratulations' in text:
+                self.logger.info("TOR is working correctly")
+                return True
+            else:
+                self.logger.error("TOR connection test failed")
+                return False
                 
-                # Get current IP through TOR
-                import requests
-                proxies = {
-                    'http': f'socks5://127.0.0.1:{self.tor_port}',
-                    'https': f'socks5://127.0.0.1:{self.tor_port}'
-                }
-                
-                response = requests.get('https://check.torproject.org/', proxies=proxies, timeout=30)
-                if 'Congratulations' in response.text:
-                    self.logger.info("TOR is working correctly")
-                    return True
-                else:
-                    self.logger.error("TOR connection test failed")
-                    return False
-                    
         except Exception as e:
             self.logger.error(f"TOR connection test error: {e}")
             return False
@@ -84,17 +118,13 @@ class TorManager:
             return False
         
         try:
-            with Controller.from_port(port=self.control_port) as controller:
-                if self.password:
-                    controller.authenticate(password=self.password)
-                else:
-                    controller.authenticate()
-                
+            async with self._controller_lock:
                 # Send NEWNYM signal to get new IP
-                controller.signal(Signal.NEWNYM)
-                self.logger.info("TOR IP rotated successfully")
-                return True
-                
+                self._get_controller().signal(Signal.NEWNYM)
+            
+            self.logger.info("TOR IP rotated successfully")
+            return True
+            
         except AuthenticationFailure:
             self.logger.error("TOR authentication failed")
             return False
@@ -104,25 +134,22 @@ class TorManager:
     
     def get_proxies(self) -> Optional[dict]:
         """Get proxy configuration for requests"""
-        if not self._connected or not self.enabled:
-            return None
-        
-        return {
-            'http': f'socks5://127.0.0.1:{self.tor_port}',
-            'https': f'socks5://127.0.0.1:{self.tor_port}'
-        }
+        return self._proxies if self._connected and self.enabled else None
     
     async def check_ip(self) -> str:
         """Get current IP address"""
         try:
-            import requests
-            proxies = self.get_proxies()
-            if proxies:
-                response = requests.get('https://api.ipify.org?format=json', proxies=proxies, timeout=30)
-                return response.json().get('ip', 'Unknown')
+            if self.get_proxies():
+                return await self._fetch_ip(self._get_session())
             else:
-                response = requests.get('https://api.ipify.org?format=json', timeout=30)
-                return response.json().get('ip', 'Unknown')
+                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+                    return await self._fetch_ip(session)
         except Exception as e:
             self.logger.error(f"Error checking IP: {e}")
-            return "Error"
\ No newline at end of file
+            return "Error"
+    
+    async def _fetch_ip(self, session: aiohttp.ClientSession) -> str:
+        """Ask ipify for the public IP seen through session"""
+        async with session.get('https://api.ipify.org?format=json') as response:
+            data = await response.json()
+        return data.get('ip', 'Unknown')
\ No newline at end of file
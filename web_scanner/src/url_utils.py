@@ -0,0 +1,7 @@
+from functools import lru_cache
+from urllib.parse import urlparse
+
+@lru_cache(maxsize=256)
+def domain_of(url: str) -> str:
+    """Domain of a source URL, or 'Unknown' (articles mostly come from a handful of sites)"""
+    return urlparse(url).netloc or 'Unknown'
\ No newline at end of file
@@ -1,17 +1,58 @@
 import asyncio
+import hashlib
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
 
+import aiofiles
 import aiohttp
-import requests
+import orjson
+import soupsieve
+from aiohttp_socks import ProxyConnector
 from bs4 import BeautifulSoup
 
+# Content cleaning: whitespace runs, then HTML entities and special
+# characters (everything except basic punctuation) in a single pass
+_WS = re.compile(r'\s+')
+_COMBINED = re.compile(r'&[a-zA-Z0-9#]+;|[^\w\s\.\,\!\?\-\:\;]')
+
+# File extensions kept for downloaded images; anything else is stored as .jpg
+_IMAGE_SUFFIXES = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.webp'})
+
+# CSS selectors used when a website does not configure its own
+_DEFAULT_SELECTORS = {
+    'articles': 'article',
+    'title': 'h1, h2, .title',
+    'content': '.content, p',
+    'image': 'img',
+    'link': 'a'
+}
+
 class WebScraper:
     """Web scraper with TOR support and content extraction"""
     
+    # Connection pool limits shared by all scrape requests
+    CONNECTION_LIMIT = 32
+    CONNECTION_LIMIT_PER_HOST = 4
+    REQUEST_TIMEOUT = 30
+    KEEPALIVE_TIMEOUT = 75
+    DNS_CACHE_TTL = 300
+    
+    # Articles downloaded, rendered and published concurrently per website
+    MAX_CONCURRENT_ARTICLES = 8
+    
+    # Threads parsing downloaded pages (lxml releases the GIL while parsing)
+    PARSE_WORKERS = 4
+    
+    # Article keys remembered across scans for deduplication (oldest are dropped first)
+    MAX_SEEN_ARTICLES = 100000
+    
     def __init__(self, config, tor_manager, content_filter, image_processor, learning_db, notifier):
         self.config = config
         self.tor_manager = tor_manager
@@ -21,101 +62,295 @@ class WebScraper:
         self.notifier = notifier
         self.logger = logging.getLogger(__name__)
         self.session = None
+        self._parse_pool = None
+        
+        # Compiled selectors per website URL, with the raw selectors they were built from
+        self._selectors: Dict[str, tuple] = {}
+        
+        # Validators and extracted articles of the last full response per URL,
+        # used for conditional requests and kept across restarts
+        self._http_cache_file = Path("data/http_cache.json")
+        self._http_cache: Dict[str, Dict[str, Any]] = self._load_http_cache()
+        self._http_cache_dirty = False
+        
+        # 64-bit keys of articles already handled, in insertion order, kept across restarts
+        self._seen_file = Path("data/seen_articles.json")
+        self._seen: Dict[int, None] = dict.fromkeys(self._load_seen())
+        self._seen_dirty = False
+        
+        # Image URLs already stored under data/images, and downloads still running
+        self._downloaded_images = set()
+        self._image_downloads: Dict[str, asyncio.Task] = {}
     
     async def start(self):
-        """Initialize HTTP session"""
-        self.session = aiohttp.ClientSession()
+        """Initialize pooled HTTP session, routed through TOR when connected"""
+        connector_options = {
+            'limit': self.CONNECTION_LIMIT,
+            'limit_per_host': self.CONNECTION_LIMIT_PER_HOST,
+            'keepalive_timeout': self.KEEPALIVE_TIMEOUT,
+            'ttl_dns_cache': self.DNS_CACHE_TTL
+        }
+        
+        proxies = self.tor_manager.get_proxies()
+        if proxies:
+            connector = ProxyConnector.from_url(proxies['https'], rdns=True, **connector_options)
+        else:
+            connector = aiohttp.TCPConnector(**connector_options)
+        
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT)
+        )
+        self._parse_pool = ThreadPoolExecutor(max_workers=self.PARSE_WORKERS, 
+                                              thread_name_prefix='html-parse')
     
     async def stop(self):
-        """Close HTTP session"""
+        """Close HTTP session and parser threads"""
         if self.session:
             await self.session.close()
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False)
     
     async def scan_websites(self):
         """Scan all configured websites"""
         websites = self.config.get('websites', [])
         results = []
         
-        for website in websites:
+        if self.session is None:
+            await self.start()
+        
+        # Fetch all websites concurrently
+        scraped = await asyncio.gather(*(self.scrape_website(website) for website in websites), 
+                                       return_exceptions=True)
+        self._save_http_cache()
+        
+        # Bounds the articles being processed at the same time
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ARTICLES)
+        
+        async def process(article):
+            async with semaphore:
+                return await self.process_article(article)
+        
+        async def publish(processed_article, is_interesting):
+            async with semaphore:
+                # Create summary image
+                summary_image = await self.create_summary_image(processed_article)
+                
+                # Send notification if interesting
+                if is_interesting:
+                    await self.notifier.send_notification(processed_article, summary_image)
+        
+        for website, articles in zip(websites, scraped):
             try:
-                articles = await self.scrape_website(website)
-                filtered_articles = await self.filter_articles(articles)
+                if isinstance(articles, Exception):
+                    raise articles
+                
+                filtered_articles = self._drop_seen(await self.filter_articles(articles))
+                
+                # Process and download media
+                processed_articles = await asyncio.gather(*map(process, filtered_articles))
+                processed_articles = [article for article in processed_articles if article]
                 
-                for article in filtered_articles:
-                    # Process and download media
-                    processed_article = await self.process_article(article)
-                    if processed_article:
-                        results.append(processed_article)
-                        
-                        # Create summary image
-                        summary_image = await self.create_summary_image(processed_article)
-                        
-                        # Send notification if interesting
-                        if await self.is_interesting(processed_article):
-                            await self.notifier.send_notification(processed_article, summary_image)
-                        
-                        # Update learning database
-                        await self.learning_db.record_article(processed_article)
+                # Score the whole batch at once
+                interesting = await self.are_interesting(processed_articles)
+                
+                await asyncio.gather(*map(publish, processed_articles, interesting))
+                results.extend(processed_articles)
+                
+                # Update learning database in one transaction per website
+                await self.learning_db.record_articles_bulk(processed_articles)
+                
+                # Only articles that made it through are skipped from now on
+                self._remember_seen(processed_articles)
                 
             except Exception as e:
                 self.logger.error(f"Error scanning website {website.get('url')}: {e}")
         
+        self._save_seen()
         return results
     
+    def _load_http_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Load the conditional request cache from disk"""
+        try:
+            if self._http_cache_file.exists():
+                return orjson.loads(self._http_cache_file.read_bytes())
+        except Exception as e:
+            self.logger.warning(f"Error loading HTTP cache: {e}")
+        return {}
+    
+    def _save_http_cache(self):
+        """Write the conditional request cache to disk if it changed"""
+        if not self._http_cache_dirty:
+            return
+        
+        try:
+            self._http_cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._http_cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(orjson.dumps(self._http_cache))
+            os.replace(tmp_file, self._http_cache_file)
+            self._http_cache_dirty = False
+        except Exception as e:
+            self.logger.error(f"Error saving HTTP cache: {e}")
+    
+    @staticmethod
+    def _article_key(article: Dict[str, Any]) -> int:
+        """64-bit hash of the article link, or of its title when it has none"""
+        key = article.get('link') or article.get('title', '')
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+    
+    def _drop_seen(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove articles handled in an earlier scan and repeats within articles"""
+        fresh = []
+        batch = set()
+        for article in articles:
+            key = self._article_key(article)
+            if key in self._seen or key in batch:
+                continue
+            batch.add(key)
+            fresh.append(article)
+        return fresh
+    
+    def _remember_seen(self, articles: List[Dict[str, Any]]):
+        """Mark articles as handled, forgetting the oldest keys beyond the limit"""
+        if not articles:
+            return
+        
+        self._seen.update(dict.fromkeys(map(self._article_key, articles)))
+        self._seen_dirty = True
+        
+        overflow = len(self._seen) - self.MAX_SEEN_ARTICLES
+        if overflow > 0:
+            for key in list(islice(self._seen, overflow)):
+                del self._seen[key]
+    
+    def _load_seen(self) -> List[int]:
+        """Load the keys of already handled articles from disk"""
+        try:
+            if self._seen_file.exists():
+                return orjson.loads(self._seen_file.read_bytes())
+        except Exception as e:
+            self.logger.warning(f"Error loading seen articles: {e}")
+        return []
+    
+    def _save_seen(self):
+        """Write the keys of already handled articles to disk if they changed"""
+        if not self._seen_dirty:
+            return
+        
+        try:
+            self._seen_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._seen_file.with_suffix('.tmp')
+            tmp_file.write_bytes(orjson.dumps(list(self._seen)))
+            os.replace(tmp_file, self._seen_file)
+            self._seen_dirty = False
+        except Exception as e:
+            self.logger.error(f"Error saving seen articles: {e}")
+    
+    def _compiled_selectors(self, website: Dict[str, Any]) -> Dict[str, soupsieve.SoupSieve]:
+        """Compiled CSS selectors for website, recompiled when its configuration changes"""
+        url = website['url']
+        selectors = website.get('selectors', {})
+        
+        cached = self._selectors.get(url)
+        if cached is None or cached[0] != selectors:
+            compiled = {
+                name: soupsieve.compile(selectors.get(name, default))
+                for name, default in _DEFAULT_SELECTORS.items()
+            }
+            cached = self._selectors[url] = (dict(selectors), compiled)
+        
+        return cached[1]
+    
     async def scrape_website(self, website: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Scrape articles from a single website"""
         url = website['url']
-        selectors = website.get('selectors', {})
+        selectors = self._compiled_selectors(website)
         
         try:
-            # Get proxies from TOR manager
-            proxies = self.tor_manager.get_proxies()
+            # Revalidate the previous response instead of refetching it
+            cached = self._http_cache.get(url)
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
             
-            # Use requests for scraping (more reliable than aiohttp for some sites)
-            response = requests.get(url, proxies=proxies, timeout=30)
-            response.raise_for_status()
+            # Pooled session, proxied through TOR when enabled (see start())
+            async with self.session.get(url, headers=headers) as response:
+                if response.status == 304 and cached:
+                    self.logger.info(f"Not modified, reusing {len(cached['articles'])} articles from {url}")
+                    scraped_at = datetime.now().isoformat()
+                    return [{**article, 'scraped_at': scraped_at} for article in cached['articles']]
+                
+                response.raise_for_status()
+                content = await response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            articles = []
+            # Parse in a worker thread so the event loop keeps serving I/O
+            loop = asyncio.get_running_loop()
+            articles = await loop.run_in_executor(self._parse_pool, self._parse_html, content, url, selectors)
             
-            # Find article elements
-            article_elements = soup.select(selectors.get('articles', 'article'))
+            self.logger.info(f"Found {len(articles)} articles on {url}")
             
-            for element in article_elements:
-                try:
-                    article = await self.extract_article_data(element, url, selectors)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    self.logger.warning(f"Error extracting article: {e}")
-                    continue
+            # Remember validators (and copies of the articles, which callers annotate)
+            if etag or last_modified:
+                self._http_cache[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'articles': [dict(article) for article in articles]
+                }
+                self._http_cache_dirty = True
+            elif self._http_cache.pop(url, None) is not None:
+                self._http_cache_dirty = True
             
-            self.logger.info(f"Found {len(articles)} articles on {url}")
             return articles
             
         except Exception as e:
             self.logger.error(f"Error scraping {url}: {e}")
             return []
     
-    async def extract_article_data(self, element, base_url: str, selectors: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    def _parse_html(self, content: bytes, url: str, 
+                    selectors: Dict[str, soupsieve.SoupSieve]) -> List[Dict[str, Any]]:
+        """Extract articles from a downloaded page (CPU-bound, no I/O)"""
+        soup = BeautifulSoup(content, 'lxml')
+        articles = []
+        
+        # Find article elements
+        article_elements = selectors['articles'].select(soup)
+        
+        for element in article_elements:
+            try:
+                article = self.extract_article_data(element, url, selectors)
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                self.logger.warning(f"Error extracting article: {e}")
+                continue
+        
+        return articles
+    
+    def extract_article_data(self, element, base_url: str, 
+                             selectors: Dict[str, soupsieve.SoupSieve]) -> Optional[Dict[str, Any]]:
         """Extract article data from HTML element"""
         try:
             # Extract title
-            title_elem = element.select_one(selectors.get('title', 'h1, h2, .title'))
+            title_elem = selectors['title'].select_one(element)
             title = title_elem.get_text(strip=True) if title_elem else ""
             
             # Extract content
-            content_elem = element.select_one(selectors.get('content', '.content, p'))
+            content_elem = selectors['content'].select_one(element)
             content = content_elem.get_text(strip=True) if content_elem else ""
             
             # Extract image
-            img_elem = element.select_one(selectors.get('image', 'img'))
+            img_elem = selectors['image'].select_one(element)
             img_src = img_elem.get('src') if img_elem else ""
             if img_src:
                 img_src = urljoin(base_url, img_src)
             
             # Extract link
-            link_elem = element.select_one(selectors.get('link', 'a'))
+            link_elem = selectors['link'].select_one(element)
             link = link_elem.get('href') if link_elem else ""
             if link:
                 link = urljoin(base_url, link)
@@ -139,11 +374,8 @@ class WebScraper:
     
     async def filter_articles(self, articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter articles based on content criteria"""
-        filtered = []
-        
-        for article in articles:
-            if await self.content_filter.is_relevant(article):
-                filtered.append(article)
+        relevant = await self.content_filter.are_relevant_batch(articles)
+        filtered = [article for article, is_relevant in zip(articles, relevant) if is_relevant]
         
         self.logger.info(f"Filtered to {len(filtered)} relevant articles")
         return filtered
@@ -167,28 +399,44 @@ class WebScraper:
             return None
     
     async def download_image(self, image_url: str) -> Optional[str]:
-        """Download image from URL"""
+        """Download image from URL, sharing one download between concurrent callers"""
+        task = self._image_downloads.get(image_url)
+        if task is None:
+            task = asyncio.ensure_future(self._download_image(image_url))
+            self._image_downloads[image_url] = task
+            task.add_done_callback(lambda _: self._image_downloads.pop(image_url, None))
+        
+        # Shielded so a cancelled caller does not abort the download for the others
+        return await asyncio.shield(task)
+    
+    async def _download_image(self, image_url: str) -> Optional[str]:
+        """Download image from URL to data/images"""
         try:
-            import os
-            from pathlib import Path
-            
             # Create images directory
             img_dir = Path("data/images")
             img_dir.mkdir(parents=True, exist_ok=True)
             
-            # Generate filename
-            filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(image_url) % 10000}.jpg"
-            filepath = img_dir / filename
+            # Stable filename derived from the URL, so repeat images are downloaded once
+            suffix = Path(urlparse(image_url).path).suffix.lower()
+            if suffix not in _IMAGE_SUFFIXES:
+                suffix = '.jpg'
+            filepath = img_dir / (hashlib.sha1(image_url.encode()).hexdigest()[:16] + suffix)
             
-            # Download image
-            proxies = self.tor_manager.get_proxies()
-            response = requests.get(image_url, proxies=proxies, timeout=30, stream=True)
-            response.raise_for_status()
+            if image_url in self._downloaded_images or filepath.exists():
+                self._downloaded_images.add(image_url)
+                return str(filepath)
             
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Stream the image to disk through the pooled (TOR-aware) session;
+            # the rename keeps interrupted downloads from looking complete
+            tmp_path = filepath.with_suffix('.part')
+            async with self.session.get(image_url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(tmp_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(65536):
+                        await f.write(chunk)
+            os.replace(tmp_path, filepath)
             
+            self._downloaded_images.add(image_url)
             return str(filepath)
             
         except Exception as e:
@@ -198,13 +446,10 @@ class WebScraper:
     def clean_content(self, content: str) -> str:
         """Clean and normalize content"""
         # Remove extra whitespace
-        content = re.sub(r'\s+', ' ', content)
-        
-        # Remove HTML entities
-        content = re.sub(r'&[a-zA-Z0-9#]+;', '', content)
+        content = _WS.sub(' ', content)
         
-        # Remove special characters but keep basic punctuation
-        content = re.sub(r'[^\w\s\.\,\!\?\-\:\;]', '', content)
+        # Remove HTML entities and special characters but keep basic punctuation
+        content = _COMBINED.sub('', content)
         
         return content.strip()
     
@@ -216,12 +461,12 @@ class WebScraper:
             self.logger.error(f"Error creating summary image: {e}")
             return None
     
-    async def is_interesting(self, article: Dict[str, Any]) -> bool:
-        """Determine if article is interesting enough for notification"""
+    async def are_interesting(self, articles: List[Dict[str, Any]]) -> List[bool]:
+        """Determine which articles are interesting enough for notification"""
         try:
-            # Use learning database to predict interest
-            return await self.learning_db.predict_interest(article)
+            # Use learning database to predict interest for the whole batch
+            return await self.learning_db.predict_interest_many(articles)
         except Exception as e:
             self.logger.error(f"Error predicting interest: {e}")
             # Fallback to basic content filtering
-            return await self.content_filter.is_high_priority(article)
\ No newline at end of file
+            return [await self.content_filter.is_high_priority(article) for article in articles]
\ No newline at end of file
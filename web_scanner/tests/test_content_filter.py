@@ -0,0 +1,35 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from src.config_manager import ConfigManager
+from src.content_filter import ContentFilter
+
+def _article(scraped_at):
+    return {
+        'title': 'Quarterly update on the project roadmap',
+        'content': ' '.join(f'word{i}' for i in range(60)),
+        'scraped_at': scraped_at.isoformat()
+    }
+
+def test_rescraped_article_hits_the_cache(tmp_path, monkeypatch):
+    content_filter = ContentFilter(ConfigManager(str(tmp_path / "config.json")))
+    calls = []
+    check = content_filter._check_relevance
+    monkeypatch.setattr(content_filter, '_check_relevance', lambda article: calls.append(1) or check(article))
+    
+    now = datetime.now()
+    first = asyncio.run(content_filter.is_relevant(_article(now)))
+    second = asyncio.run(content_filter.is_relevant(_article(now + timedelta(hours=1))))
+    
+    assert first == second
+    assert len(calls) == 1
+
+def test_recency_is_not_cached(tmp_path):
+    content_filter = ContentFilter(ConfigManager(str(tmp_path / "config.json")))
+    
+    old = _article(datetime.now() - timedelta(days=2))
+    old['title'] = 'Quarterly report on the project roadmap'
+    recent = dict(old, scraped_at=datetime.now().isoformat())
+    
+    assert not asyncio.run(content_filter.is_high_priority(old))
+    assert asyncio.run(content_filter.is_high_priority(recent))
@@ -0,0 +1,44 @@
+import asyncio
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from src.config_manager import ConfigManager
+from src.image_processor import ImageProcessor
+
+TITLE = 'A reasonably long headline for the summary image'
+
+def _title_contrast(tmp_path, monkeypatch, with_image):
+    """Render the title as create_summary does and return (glyph, background) mean luminance"""
+    monkeypatch.chdir(tmp_path)
+    processor = ImageProcessor(ConfigManager(str(tmp_path / "config.json")))
+    
+    img = Image.new('RGB', (processor.width, processor.height), color='white')
+    draw = ImageDraw.Draw(img)
+    
+    start_y = 0
+    if with_image:
+        Image.new('RGB', (640, 480), color=(30, 90, 160)).save(tmp_path / "featured.jpg")
+        start_y = asyncio.run(processor._add_featured_image(img, draw, str(tmp_path / "featured.jpg")))
+    asyncio.run(processor._add_title(draw, TITLE, start_y))
+    
+    # Mask of the title glyphs at the position _add_title uses
+    wrapped = processor._wrap_text(TITLE, processor.title_font)
+    bbox = draw.textbbox((0, 0), wrapped, font=processor.title_font)
+    mask = Image.new('L', img.size, 0)
+    ImageDraw.Draw(mask).text(((processor.width - (bbox[2] - bbox[0])) // 2, start_y + 20), 
+                              wrapped, fill=255, font=processor.title_font)
+    
+    glyphs = np.asarray(mask) > 128
+    rows = glyphs.any(axis=1)
+    pixels = np.asarray(img.convert('L')).astype(float)
+    background = pixels[rows][~glyphs[rows]]
+    return pixels[glyphs].mean(), np.median(background)
+
+def test_title_contrasts_with_background_below_featured_image(tmp_path, monkeypatch):
+    glyph, background = _title_contrast(tmp_path, monkeypatch, with_image=True)
+    assert background - glyph > 128
+
+def test_title_contrasts_with_background_without_featured_image(tmp_path, monkeypatch):
+    glyph, background = _title_contrast(tmp_path, monkeypatch, with_image=False)
+    assert background - glyph > 128
@@ -0,0 +1,27 @@
+import sqlite3
+
+import pytest
+
+from src.config_manager import ConfigManager
+from src.learning_database import LearningDatabase
+
+def test_failed_commit_does_not_leave_the_writer_in_a_transaction(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = LearningDatabase(ConfigManager(str(tmp_path / "config.json")))
+    try:
+        # A deferred foreign key violation only surfaces at COMMIT
+        db._conn.execute('PRAGMA foreign_keys=ON')
+        with db._writer() as conn:
+            conn.execute('CREATE TABLE parent (id INTEGER PRIMARY KEY)')
+            conn.execute('CREATE TABLE child (parent_id INTEGER REFERENCES parent(id) '
+                         'DEFERRABLE INITIALLY DEFERRED)')
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            with db._writer() as conn:
+                conn.execute('INSERT INTO child VALUES (1)')
+        
+        assert not db._conn.in_transaction
+        with db._writer() as conn:
+            conn.execute('INSERT INTO parent VALUES (1)')
+    finally:
+        db.close()